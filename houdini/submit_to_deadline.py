@@ -1,11 +1,133 @@
+import errno
 import os
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import hou
 
+win32file = None
+if sys.platform == "win32":
+    try:
+        import win32file
+    except ImportError:
+        # pywin32 isn't installed; use the buffered copy instead
+        pass
+
 # Globals
 FARM_FOLDER = "//shared_drive/project/renders/"
 
+# FARM_FOLDER with exactly one trailing slash, for building render folder paths
+_FARM_FOLDER_PREFIX = FARM_FOLDER.rstrip("/") + "/"
+
+# Number of dependency files copied to the render folder at once
+_COPY_WORKERS = 8
+
+# NOTE: The copy helpers below (_KERNEL_COPY_* through _fastcopy) are duplicated in
+# maya/save_maya_shelves.py, since the Houdini and Maya tools ship separately. Apply fixes to both.
+# tests/test_fastcopy.py fails if the shared parts drift apart.
+# Only this copy has the Win32 CopyFile branch, for render submissions to the UNC farm share.
+
+# Max bytes handed to the kernel per copy_file_range/sendfile call
+_KERNEL_COPY_CHUNK = 2 ** 30
+
+# Buffer size for the read/write fallback copy. Much larger than shutil's default to cut
+# syscalls when pushing caches and textures to the farm share; gains level off past ~1 MiB.
+_COPY_BUFSIZE = 1024 * 1024
+
+# Errors meaning the kernel can't do this particular copy, so try the next strategy
+_KERNEL_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+
+def _copy_file_range_chunk(src_fd, dst_fd):
+    return os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK)
+
+
+def _sendfile_chunk(src_fd, dst_fd):
+    return os.sendfile(dst_fd, src_fd, None, _KERNEL_COPY_CHUNK)
+
+
+# Zero-copy strategies available on this platform, in order of preference
+_KERNEL_COPY_FUNCS = []
+if sys.platform.startswith("linux"):
+    if hasattr(os, "copy_file_range"):
+        _KERNEL_COPY_FUNCS.append(_copy_file_range_chunk)
+    if hasattr(os, "sendfile"):
+        _KERNEL_COPY_FUNCS.append(_sendfile_chunk)
+
+
+def _kernel_copy(src, dst):
+    '''
+    Copy src to dst without the data passing through user space.
+
+    Returns:
+        bool: True if the file was copied, False if no zero-copy strategy worked for these paths.
+    '''
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            src_size = os.fstat(src_fd).st_size
+            for copy_chunk in _KERNEL_COPY_FUNCS:
+                try:
+                    copied = copy_chunk(src_fd, dst_fd)
+                    if not copied and src_size:
+                        # Some filesystems (FUSE, network mounts) report 0 without copying anything.
+                        # Nothing was written, so just try the next strategy.
+                        continue
+                    while copied:
+                        copied = copy_chunk(src_fd, dst_fd)
+                    return True
+                except OSError as e:
+                    if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                        raise
+                    # Start over with the next strategy
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _fastcopy(src, dst):
+    '''
+    Copy the contents of src to dst.
+
+    On Windows, uses the Win32 CopyFile API when pywin32 is available, which lets SMB shares copy
+    server-side. Otherwise tries os.copy_file_range first (server-side/reflink copy on NFS, btrfs, XFS),
+    then os.sendfile, and finally falls back to a buffered read/write copy.
+
+    Args:
+        src (str): Source file path.
+        dst (str): Destination file path.
+
+    Raises:
+        shutil.SameFileError: If src and dst are the same file.
+    '''
+    # dst is truncated before src is read, so copying a file onto itself would empty it
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    if win32file is not None:
+        win32file.CopyFile(src, dst, False)
+        return
+
+    if _KERNEL_COPY_FUNCS and _kernel_copy(src, dst):
+        return
+
+    # Read into one reusable buffer rather than allocating a new bytes object per chunk
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        while True:
+            n = src_file.readinto(buf)
+            if not n:
+                break
+            dst_file.write(view[:n])
+
 
 class SubmitToDeadline():
     '''
@@ -56,8 +178,10 @@ class SubmitToDeadline():
         _now = datetime.now()
         TIME = _now.strftime("%Y%m%d_%H%M%S")
 
-        dst_folder = os.path.join(FARM_FOLDER, f"{TIME}_{self.filename}")
-        os.makedirs(dst_folder, exist_ok=False)
+        dst_folder = f"{_FARM_FOLDER_PREFIX}{TIME}_{self.filename}"
+        # FARM_FOLDER already exists and the timestamped name is unique, so no parent creation
+        # or existence check is needed. Raises FileExistsError on a clash, as before.
+        os.mkdir(dst_folder)
 
         self._destination_folder = dst_folder
         return self._destination_folder
@@ -72,16 +196,20 @@ class SubmitToDeadline():
             dst (str): Destination file path.
         
         Returns:
-            bool: True if the file is successfully copied, False otherwise.
+            bool: True once the file is copied.
+
+        Raises:
+            OSError: If the file couldn't be copied.
         '''
-        try:
-            shutil.copyfile(src, dst)
-            return True
-        except Exception as e:
-            os.makedirs(dst, exist_ok=True)
-            shutil.copyfile(src, dst)
-            return True
-        raise RuntimeError(f"Didn't copy from {src} to {dst}")
+        parent = os.path.dirname(dst)
+
+        # The render folder was just created by create_render_folder, so only other folders need checking.
+        # A bare filename has no parent to create.
+        if parent and parent != self._destination_folder:
+            os.makedirs(parent, exist_ok=True)
+
+        _fastcopy(src, dst)
+        return True
 
    
     def save_and_duplicate_this_file(self):
@@ -91,11 +219,46 @@ class SubmitToDeadline():
         raise NotImplementedError
 
 
-    def copy_dependencies(self):
+    def get_source_root(self):
         '''
-        Copy dependency files to the render folder.
+        Return the folder dependency paths are relative to. The render folder mirrors its layout.
+
+        Returns:
+            str: Source root folder path.
         '''
-        raise NotImplementedError
+        return os.path.dirname(self.this_file)
+
+
+    def copy_dependencies(self, dependency_files):
+        '''
+        Copy dependency files to the render folder, keeping their layout relative to the source root
+        so relative references still resolve when the file is rendered from there.
+        Copies run in parallel since each one mostly waits on the shared drive.
+
+        Args:
+            dependency_files (list): List of files to copy to the render location. Duplicates are copied once.
+
+        Raises:
+            RuntimeError: If a dependency is outside the source root.
+        '''
+        dst_folder = self.get_render_folder()
+        source_root = self.get_source_root()
+
+        # Work out every destination before any copy starts, so a bad path doesn't leave a partial copy
+        dst_by_src = {}
+        for src in set(dependency_files):
+            try:
+                relative_path = os.path.relpath(src, source_root)
+            except ValueError:
+                # Different drive on Windows
+                relative_path = os.pardir
+            if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+                raise RuntimeError(f"Dependency {src} is outside {source_root} and can't be copied to the render folder")
+            dst_by_src[src] = os.path.join(dst_folder, relative_path)
+
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            # Consume the results so any copy error is raised here
+            list(executor.map(self.copy_file_for_render, dst_by_src.keys(), dst_by_src.values()))
 
 
     def trigger_submit(self):
@@ -130,7 +293,7 @@ class SubmitToDeadline():
         if from_open_GUI:
             self.save_and_duplicate_this_file()
         else:
-            self.copy_file_for_render(self.this_file, dst_folder)
+            self.copy_file_for_render(self.this_file, os.path.join(dst_folder, os.path.basename(self.this_file)))
             
         if dependency_files:
             self.copy_dependencies(dependency_files)
@@ -151,20 +314,34 @@ class HoudiniSubmit(SubmitToDeadline):
             this_file (str, optional): Path to the current file. Defaults to None.
             filename (str, optional): Name of the current file. Defaults to None.
         '''
-        self.this_file = this_file if this_file else hou.expandString("$HIPFILE")
-        self.filename = filename if filename else hou.expandString("$HIPNAME")
+        this_file = this_file if this_file else hou.expandString("$HIPFILE")
+        filename = filename if filename else hou.expandString("$HIPNAME")
+        super().__init__(this_file, filename)
     
 
+    def get_source_root(self):
+        '''
+        Return $HIP, which the scene's relative file references resolve from.
+
+        Returns:
+            str: Source root folder path.
+        '''
+        return hou.expandString("$HIP")
+
+
     def save_and_duplicate_this_file(self):
         '''
-        Save the current Houdini file and save to the render folder.
+        Save the current Houdini file and copy it to the render folder.
         '''
         destination_folder = self.get_render_folder()
 
         render_location = os.path.join(destination_folder, f"{self.filename}.hip")
         
         hou.hipFile.save()
-        hou.hipFile.save(render_location)
+        # Copy the file just saved rather than serializing the scene a second time.
+        # On CoW filesystems copy_file_range makes this a metadata-only reflink.
+        # save() writes to the scene's current path, which may differ from self.this_file after a Save As.
+        self.copy_file_for_render(hou.hipFile.path(), render_location)
 
     
     def get_file_references(self, error_if_external_refs=True):
@@ -176,14 +353,39 @@ class HoudiniSubmit(SubmitToDeadline):
 
         Returns:
             list: List of file dependencies.
+
+        Raises:
+            RuntimeError: If error_if_external_refs is True and files outside $HIP are referenced.
         '''
-        warnings = ''
-        dependencies = []
         current_folder = hou.expandString("$HIP")
-
-        for parm, path in hou.fileReferences():
-
-            if path in current_folder:
-                if path in parm.rawValue():
-                    relative_path = path.replace(current_folder, '$HIP')
-                    parm.set
+        # Houdini paths always use forward slashes, on Windows too
+        prefix = current_folder.rstrip("/") + "/"
+        # fileReferences() hands back references already written relative to $HIP in this form
+        hip_prefix = "$HIP/"
+
+        # fileReferences() walks every parm in the scene, so only call it once
+        file_references = hou.fileReferences()
+        paths = {path for _, path in file_references if path}
+        absolute_internal_paths = {path for path in paths if path.startswith(prefix)}
+        relative_internal_paths = {path for path in paths if path.startswith(hip_prefix)}
+        external_paths = paths - absolute_internal_paths - relative_internal_paths
+
+        # Check for external references before changing anything in the scene
+        if external_paths:
+            external_list = "\n".join(sorted(external_paths))
+            warnings = f"External file references found outside {current_folder}:\n{external_list}"
+            if error_if_external_refs:
+                raise RuntimeError(warnings)
+            print(warnings)
+
+        # Make absolute references inside $HIP relative so they resolve from the render folder
+        for parm, path in file_references:
+            if parm is not None and path in absolute_internal_paths:
+                raw_value = parm.rawValue()
+                # Only swap the leading folder; $HIP can also appear inside file names
+                if raw_value.startswith(prefix):
+                    parm.set(hip_prefix + raw_value[len(prefix):])
+
+        expanded_relative_paths = {prefix + path[len(hip_prefix):] for path in relative_internal_paths}
+        dependencies = sorted(absolute_internal_paths | expanded_relative_paths)
+        return dependencies
@@ -9,9 +9,12 @@ when a release version is ready.
 
 """
 
+import errno
+import functools
 import os
 import re
 import shutil
+import sys
 import maya.cmds as cmds
 
 from P4 import P4, P4Exception
@@ -21,7 +24,36 @@ from p4util.submitter import P4Submitter
 from constants import GLOBAL_SHELF_DIR, LOCAL_SHELF_DIR, PRESET_SHELF_DIR
 
 # Define the order in which shelves should appear
-SHELF_ORDER = ['Shotgrid', 'vm_AI', 'vm_Assets', 'vm_Metahumans', 'vm_Rigging', 'vm_AnimTools', 'vm_Utils', 'Custom']
+SHELF_ORDER = ('Shotgrid', 'vm_AI', 'vm_Assets', 'vm_Metahumans', 'vm_Rigging', 'vm_AnimTools', 'vm_Utils', 'Custom')
+
+# Position of each shelf in SHELF_ORDER; shelves not in the list sort after all of them
+_SHELF_ORDER_IDX = {name: i for i, name in enumerate(SHELF_ORDER)}
+_SHELF_ORDER_FALLBACK = len(SHELF_ORDER)
+
+# Shelf directory for each shelf context
+_SHELF_DIRECTORIES = {
+    'local': LOCAL_SHELF_DIR,
+    'preset': PRESET_SHELF_DIR,
+    'global': GLOBAL_SHELF_DIR
+}
+
+# Maya shelf file naming convention, capturing the short shelf name
+_SHELF_RE = re.compile(r"^shelf_(\S*?)\.mel$")
+
+# NOTE: The copy helpers below (_KERNEL_COPY_* through _fastcopy) are duplicated in
+# houdini/submit_to_deadline.py, since the Houdini and Maya tools ship separately. Apply fixes to both.
+# tests/test_fastcopy.py fails if the shared parts drift apart.
+# The Houdini copy also has a Win32 CopyFile branch; shelf files are small enough not to need it.
+
+# Max bytes handed to the kernel per copy_file_range/sendfile call
+_KERNEL_COPY_CHUNK = 2 ** 30
+
+# Buffer size for the read/write fallback copy. Much larger than shutil's default to cut
+# syscalls when pushing shelves into Perforce-mounted shelf directories; gains level off past ~1 MiB.
+_COPY_BUFSIZE = 1024 * 1024
+
+# Errors meaning the kernel can't do this particular copy, so try the next strategy
+_KERNEL_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP}
 
 
 # Utility Functions
@@ -32,12 +64,12 @@ def is_directory(path_to_check):
 
 def is_shelf_file(file_name):
     """Return True if the file name matches the convention of a Maya shelf file."""
-    return re.match(r"^shelf_\S*\.mel", file_name)
+    return _SHELF_RE.match(file_name) is not None
 
 
 def extract_short_shelf_name(shelf_file):
     """Extract the short name of the shelf file (without the "shelf_" prefix and ".mel" suffix)."""
-    return re.findall(r"^shelf_(\S*?)\.mel", shelf_file)[0]
+    return _SHELF_RE.match(shelf_file).group(1)
 
 
 def concat_long_shelf_name(short_shelf_name):
@@ -49,36 +81,22 @@ def sort_shelves_from_ref_list(shelf_list):
     """
     Sort the list of shelf names with those found in the reference SHELF_ORDER list.
     """
-    reference_list = SHELF_ORDER
-
-    # Define a custom key function to handle missing values
-    def custom_key(elem):
-        try:
-            return reference_list.index(elem)
-        except ValueError:
-            # If the element is not found in the reference list, return a large index
-            return len(reference_list)
-
     # Sort the original list based on the order of elements in the reference list
-    sorted_list = sorted(shelf_list, key=custom_key)
+    sorted_list = sorted(shelf_list, key=lambda elem: _SHELF_ORDER_IDX.get(elem, _SHELF_ORDER_FALLBACK))
     return sorted_list
 
 
 # Shelf Management Functions
+@functools.lru_cache(maxsize=3)
 def get_shelf_dir_by_context(shelf_context):
     """
     Return the directory path of the Maya shelf location based on the context (local, preset, global).
+    Results are cached per context; errors are raised every call and never cached.
     """
-    directories = {
-        'local': LOCAL_SHELF_DIR,
-        'preset': PRESET_SHELF_DIR,
-        'global': GLOBAL_SHELF_DIR
-    }
-    
-    shelf_directory = directories.get(shelf_context, 'Invalid keyword')
+    if shelf_context not in _SHELF_DIRECTORIES:
+        raise RuntimeError(f"Invalid shelf context selected. Select from {_SHELF_DIRECTORIES.keys()}")
 
-    if shelf_context == 'Invalid keyword':
-        raise RuntimeError(f"Invalid shelf context selected. Select from {directories.keys()}")
+    shelf_directory = _SHELF_DIRECTORIES[shelf_context]
     
     if not is_directory(shelf_directory):
         raise RuntimeError(f"{shelf_directory} is not a directory. Check constants file for values.")
@@ -93,24 +111,100 @@ def get_ordered_shelves(shelf_context):
     shelf_directory = get_shelf_dir_by_context(shelf_context)
     shelf_list = []
 
-    for filename in os.listdir(shelf_directory):
-        if is_shelf_file(filename):
-            shelf_name = extract_short_shelf_name(filename)
-            shelf_list.append(shelf_name)
+    # DirEntry.is_file() uses the type info from the directory listing, so no extra stat per file
+    with os.scandir(shelf_directory) as entries:
+        for entry in entries:
+            match = _SHELF_RE.match(entry.name)
+            if match and entry.is_file():
+                shelf_list.append(match.group(1))
 
     ordered_list = sort_shelves_from_ref_list(shelf_list)
     return ordered_list
 
 
 # File Operations Functions
+def _copy_file_range_chunk(src_fd, dst_fd):
+    return os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK)
+
+
+def _sendfile_chunk(src_fd, dst_fd):
+    return os.sendfile(dst_fd, src_fd, None, _KERNEL_COPY_CHUNK)
+
+
+# Zero-copy strategies available on this platform, in order of preference
+_KERNEL_COPY_FUNCS = []
+if sys.platform.startswith("linux"):
+    if hasattr(os, "copy_file_range"):
+        _KERNEL_COPY_FUNCS.append(_copy_file_range_chunk)
+    if hasattr(os, "sendfile"):
+        _KERNEL_COPY_FUNCS.append(_sendfile_chunk)
+
+
+def _kernel_copy(src, dst):
+    """
+    Copy src to dst without the data passing through user space.
+    Return False if no zero-copy strategy worked for these paths.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            src_size = os.fstat(src_fd).st_size
+            for copy_chunk in _KERNEL_COPY_FUNCS:
+                try:
+                    copied = copy_chunk(src_fd, dst_fd)
+                    if not copied and src_size:
+                        # Some filesystems (FUSE, network mounts) report 0 without copying anything.
+                        # Nothing was written, so just try the next strategy.
+                        continue
+                    while copied:
+                        copied = copy_chunk(src_fd, dst_fd)
+                    return True
+                except OSError as e:
+                    if e.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                        raise
+                    # Start over with the next strategy
+                    os.lseek(src_fd, 0, os.SEEK_SET)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    os.ftruncate(dst_fd, 0)
+            return False
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _fastcopy(src, dst):
+    """
+    Copy the contents of src to dst, trying os.copy_file_range, then os.sendfile,
+    then a buffered read/write copy. Raise shutil.SameFileError if src and dst are the same file.
+    """
+    # dst is truncated before src is read, so copying a file onto itself would empty it
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    if _KERNEL_COPY_FUNCS and _kernel_copy(src, dst):
+        return
+
+    # Read into one reusable buffer rather than allocating a new bytes object per chunk
+    buf = bytearray(_COPY_BUFSIZE)
+    view = memoryview(buf)
+    with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        while True:
+            n = src_file.readinto(buf)
+            if not n:
+                break
+            dst_file.write(view[:n])
+
+
 def get_full_shelf_path(short_shelf_name, shelf_context):
     """
     Get the full path of the shelf given the short name and shelf context.
     """
     full_shelf_name = concat_long_shelf_name(short_shelf_name)
-    shelf_dir = get_shelf_dir_by_context(shelf_context)
+    shelf_dir = get_shelf_dir_by_context(shelf_context).rstrip("/\\")
 
-    file_path = os.path.join(shelf_dir, full_shelf_name)
+    file_path = f"{shelf_dir}/{full_shelf_name}"
 
     return file_path
 
@@ -119,7 +213,7 @@ def copy_local_shelf_to_global_location(local_shelf_path, global_shelf_path):
     """
     Copy the local shelf file to the global shelf location.
     """
-    shutil.copyfile(local_shelf_path, global_shelf_path)
+    _fastcopy(local_shelf_path, global_shelf_path)
 
 
 # Perforce Operations Functions
@@ -157,41 +251,96 @@ def show_checked_out_dialog():
 
         return result
 
-def checkout_p4_file(p4, global_shelf_path):
+def _p4_path_key(file_path):
     """
-    Checkout a file from Perforce.
+    Normalize a local file path so fstat's clientFile can be matched against it.
+    Paths are resolved so symlinked workspace roots still match.
     """
-    file_info = p4.run("fstat", global_shelf_path)[0]
-    opened_files = p4.run('opened', global_shelf_path)
+    return os.path.normcase(os.path.realpath(file_path))
 
-    is_checked_out = bool(opened_files)
 
-    if not is_checked_out:  # Sync and check it out
-        p4.run("sync", global_shelf_path)
-        p4.run("edit", global_shelf_path)
+def get_p4_file_infos(p4, file_paths):
+    """
+    Run a single fstat over all the given files and return the result for each given path.
+    Files that are not in the depot yet map to None.
+    Raise RuntimeError if fstat returns a file that can't be matched back to one of the paths,
+    rather than mistaking that depot file for a new one.
+    """
+    file_infos = p4.run("fstat", *file_paths)
 
-        file_info = p4.run("files", global_shelf_path)
-        if not file_info:
-            p4.run("add", global_shelf_path)  # Add the file to Perforce if not already added
+    # Depot-syntax paths match depotFile exactly. Anything else is a local path, including UNC
+    # shares that also start with "//", and is matched against the resolved clientFile.
+    infos_by_depot_file = {file_info['depotFile']: file_info for file_info in file_infos}
+    infos_by_client_file = {_p4_path_key(file_info['clientFile']): file_info for file_info in file_infos}
+
+    infos_by_path = {}
+    for file_path in file_paths:
+        file_info = infos_by_depot_file.get(file_path)
+        if file_info is None:
+            file_info = infos_by_client_file.get(_p4_path_key(file_path))
+        infos_by_path[file_path] = file_info
+
+    matched_depot_files = {file_info['depotFile'] for file_info in infos_by_path.values() if file_info}
+    unmatched_depot_files = [file_info['depotFile'] for file_info in file_infos
+                             if file_info['depotFile'] not in matched_depot_files]
+    if unmatched_depot_files:
+        raise RuntimeError(f"Could not match Perforce files {unmatched_depot_files} to the requested paths {file_paths}")
+
+    return infos_by_path
+
+
+def checkout_p4_files(p4, global_shelf_paths):
+    """
+    Checkout files from Perforce, using one fstat round-trip for all of them.
+    Return False without changing anything if any file is checked out by another user.
+    """
+    file_infos = get_p4_file_infos(p4, global_shelf_paths)
+
+    to_edit = []
+    to_sync = []
+    to_add = []
+
+    for global_shelf_path in global_shelf_paths:
+        file_info = file_infos[global_shelf_path]
+
+        if file_info is None:
+            to_add.append(global_shelf_path)  # Add the file to Perforce if not already added
+
+        elif 'action' in file_info:  # Checked out by current user
+            current_version = file_info.get('haveRev')
+            versions = file_info.get('headRev')
 
-    else:
-        # Checked out by someone else, simply tell the user about it.
-        if opened_files['user'] != p4.user:
-            show_checked_out_dialog()
-            return False
-        
-        else:  # Checked out by current user
-            current_version = file_info['haveRev']
-            versions = file_info['headRev']
-            
             is_latest_version = current_version == versions
 
             if not is_latest_version:
-                p4.run("sync", global_shelf_path)
+                to_sync.append(global_shelf_path)
+
+        elif 'otherOpen' in file_info:
+            # Checked out by someone else, simply tell the user about it.
+            show_checked_out_dialog()
+            return False
+
+        else:  # Sync and check it out
+            to_sync.append(global_shelf_path)
+            to_edit.append(global_shelf_path)
+
+    if to_sync:
+        p4.run("sync", *to_sync)
+    if to_edit:
+        p4.run("edit", *to_edit)
+    if to_add:
+        p4.run("add", *to_add)
 
     return True
 
 
+def checkout_p4_file(p4, global_shelf_path):
+    """
+    Checkout a file from Perforce.
+    """
+    return checkout_p4_files(p4, [global_shelf_path])
+
+
 def submit_file_to_perforce(p4, global_shelf_path, local_shelf_path):
     """
     Submit the file to Perforce.
@@ -0,0 +1,166 @@
+"""
+Tests for the _fastcopy helper, which is duplicated in the Houdini and Maya scripts.
+
+The helper is loaded straight from each script's source so the tests don't need
+Houdini or Maya, and the two copies are checked against each other so they can't drift apart.
+"""
+
+import ast
+import os
+import shutil
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOUDINI_SCRIPT = os.path.join(REPO_ROOT, "houdini", "submit_to_deadline.py")
+MAYA_SCRIPT = os.path.join(REPO_ROOT, "maya", "save_maya_shelves.py")
+
+# Module-level names that make up the copy helper
+HELPER_NAMES = {
+    "_KERNEL_COPY_CHUNK",
+    "_COPY_BUFSIZE",
+    "_KERNEL_COPY_FALLBACK_ERRNOS",
+    "_copy_file_range_chunk",
+    "_sendfile_chunk",
+    "_KERNEL_COPY_FUNCS",
+    "_kernel_copy",
+    "_fastcopy",
+}
+
+# Helper names whose code is expected to be identical in both scripts
+SHARED_NAMES = HELPER_NAMES - {"_fastcopy"}
+
+
+def _defined_names(node):
+    """Return the module-level names a statement defines."""
+    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, ast.Assign):
+        return {target.id for target in node.targets if isinstance(target, ast.Name)}
+    if isinstance(node, ast.If):
+        # Platform checks that fill in a module-level list, e.g. _KERNEL_COPY_FUNCS.append(...)
+        return {child.value.id for child in ast.walk(node)
+                if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name)}
+    return set()
+
+
+def _helper_nodes(script_path):
+    """Return the statements that define the copy helper, in source order, keyed by the name they define."""
+    with open(script_path, "rb") as script:
+        tree = ast.parse(script.read())
+
+    nodes = {}
+    for node in tree.body:
+        for name in _defined_names(node) & HELPER_NAMES:
+            nodes.setdefault(name, []).append(node)
+    return nodes
+
+
+def _dump_code(nodes):
+    """Return a dump of the statements without docstrings, for comparing code only."""
+    dumps = []
+    for node in nodes:
+        node = ast.parse(ast.unparse(node)).body[0]
+        if isinstance(node, ast.FunctionDef) and ast.get_docstring(node) is not None:
+            node.body = node.body[1:]
+        dumps.append(ast.dump(node))
+    return dumps
+
+
+def load_helper(script_path):
+    """Execute only the copy helper from the given script and return its namespace."""
+    nodes = _helper_nodes(script_path)
+    unique_nodes = {id(node): node for name_nodes in nodes.values() for node in name_nodes}
+    ordered = sorted(unique_nodes.values(), key=lambda node: node.lineno)
+
+    namespace = {"win32file": None}
+    exec("import errno, os, shutil, sys", namespace)
+    exec(compile(ast.Module(body=ordered, type_ignores=[]), script_path, "exec"), namespace)
+    return namespace
+
+
+class FastCopyTestMixin:
+    script_path = None
+
+    def setUp(self):
+        self.helper = load_helper(self.script_path)
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+        self.data = os.urandom(3 * 1024 * 1024 + 7)
+        self.src = os.path.join(self.tmp_dir, "src.bin")
+        self.dst = os.path.join(self.tmp_dir, "dst.bin")
+        with open(self.src, "wb") as src_file:
+            src_file.write(self.data)
+
+    def assertCopied(self):
+        with open(self.dst, "rb") as dst_file:
+            self.assertEqual(dst_file.read(), self.data)
+
+    def test_copies_contents(self):
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_buffered_fallback_copies_contents(self):
+        self.helper["_KERNEL_COPY_FUNCS"][:] = []
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_overwrites_existing_destination(self):
+        with open(self.dst, "wb") as dst_file:
+            dst_file.write(b"x" * (len(self.data) * 2))
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_copies_empty_file(self):
+        self.data = b""
+        with open(self.src, "wb"):
+            pass
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_strategy_returning_zero_falls_back(self):
+        # Some filesystems report 0 from copy_file_range without copying anything
+        def copies_nothing(src_fd, dst_fd):
+            return 0
+
+        self.helper["_KERNEL_COPY_FUNCS"][:] = [copies_nothing]
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_unsupported_strategy_falls_back(self):
+        def not_supported(src_fd, dst_fd):
+            os.write(dst_fd, b"partial")
+            raise OSError(self.helper["errno"].EXDEV, "Invalid cross-device link")
+
+        self.helper["_KERNEL_COPY_FUNCS"][:] = [not_supported]
+        self.helper["_fastcopy"](self.src, self.dst)
+        self.assertCopied()
+
+    def test_same_file_raises(self):
+        with self.assertRaises(shutil.SameFileError):
+            self.helper["_fastcopy"](self.src, self.src)
+        self.assertEqual(os.path.getsize(self.src), len(self.data))
+
+
+class HoudiniFastCopyTest(FastCopyTestMixin, unittest.TestCase):
+    script_path = HOUDINI_SCRIPT
+
+
+class MayaFastCopyTest(FastCopyTestMixin, unittest.TestCase):
+    script_path = MAYA_SCRIPT
+
+
+class FastCopyDriftTest(unittest.TestCase):
+
+    def test_shared_helpers_match(self):
+        houdini_nodes = _helper_nodes(HOUDINI_SCRIPT)
+        maya_nodes = _helper_nodes(MAYA_SCRIPT)
+
+        for name in sorted(SHARED_NAMES):
+            with self.subTest(name=name):
+                self.assertEqual(_dump_code(houdini_nodes[name]), _dump_code(maya_nodes[name]))
+
+
+if __name__ == "__main__":
+    unittest.main()
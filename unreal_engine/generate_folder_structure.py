@@ -1,6 +1,18 @@
 import unreal
 import json
 import os
+from collections import deque
+
+try:
+    import ijson
+except ImportError:
+    # Not bundled with Unreal's Python; fall back to loading the whole file
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class FolderCreator:
     def __init__(self, json_filename):
@@ -12,40 +24,112 @@ class FolderCreator:
         '''
         self.json_filename = json_filename
 
+        # Full path to the JSON file, next to this script
+        self.json_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), json_filename)
+
+        # Paths already known to exist in the asset registry
+        self._dir_cache = set()
+
+    def _cache_directory(self, folder_path):
+        '''
+        Record the folder and all of its parent folders as existing.
+
+        Args:
+            folder_path (str): Folder path known to exist.
+        '''
+        while folder_path and folder_path not in self._dir_cache:
+            self._dir_cache.add(folder_path)
+            folder_path = folder_path.rstrip("/").rpartition("/")[0]
+
+    def _create_folder(self, folder_path):
+        '''
+        Create the folder in Unreal unless it was already created or found by this FolderCreator.
+
+        Args:
+            folder_path (str): Folder path to create.
+        '''
+        if folder_path in self._dir_cache:
+            return
+
+        # make_directory is a no-op for existing folders, so skip the does_directory_exist round-trip
+        if unreal.EditorAssetLibrary.make_directory(folder_path):
+            # make_directory also succeeds for existing folders, so this may not be a new folder
+            unreal.log("Ensured folder: {}".format(folder_path))
+            self._cache_directory(folder_path)
+        else:
+            unreal.log_error("Failed to create folder: {}".format(folder_path))
+
     def create_folders(self, root_path, structure):
         '''
-        Recursively create folders based on the provided structure.
+        Create folders based on the provided structure.
 
         Args:
             root_path (str): Root path where folders will be created.
             structure (dict): Dictionary containing folder structure.
         '''
-        for key, value in structure.items():
-            folder_path = os.path.join(root_path, key)
-            if not unreal.EditorAssetLibrary.does_directory_exist(folder_path):
-                unreal.EditorAssetLibrary.make_directory(folder_path)
-                unreal.log("Created folder: {}".format(folder_path))
-            if isinstance(value, dict):
-                self.create_folders(folder_path, value)
+        # Collect every folder path up front, breadth first, so parents always come before children
+        folder_paths = []
+        queue = deque([(root_path.rstrip("/"), structure)])
+        while queue:
+            base_path, sub_structure = queue.popleft()
+            for key, value in sub_structure.items():
+                folder_path = f"{base_path}/{key}"
+                folder_paths.append(folder_path)
+                if isinstance(value, dict):
+                    queue.append((folder_path, value))
+
+        for folder_path in folder_paths:
+            self._create_folder(folder_path)
+
+    def create_folders_from_stream(self, root_path, json_file):
+        '''
+        Create folders while streaming the JSON folder structure, without loading the whole file.
+
+        Args:
+            root_path (str): Root path where folders will be created.
+            json_file (file): JSON file containing folder structure, opened in binary mode.
+        '''
+        # One entry per open map: the key currently being read at that depth
+        path_stack = [root_path.rstrip("/")]
+        # Like create_folders, only recurse into maps; anything inside an array is skipped
+        array_depth = 0
+        for _, event, value in ijson.parse(json_file):
+            if event == "start_array":
+                array_depth += 1
+            elif event == "end_array":
+                array_depth -= 1
+            elif array_depth:
+                continue
+            elif event == "start_map":
+                path_stack.append(None)
+            elif event == "map_key":
+                path_stack[-1] = value
+                self._create_folder("/".join(path_stack))
+            elif event == "end_map":
+                path_stack.pop()
 
     def main(self):
         '''
         Main function to create folders based on the JSON file.
         '''
-        # Get the directory of the current script
-        script_dir = os.path.dirname(__file__)
-
-        # Construct the full path to the JSON file
-        json_file_path = os.path.join(script_dir, self.json_filename)
-
-        # Load JSON data
-        with open(json_file_path, "r") as file:
-            structure = json.load(file)
-
         # Root content folder path in Unreal
         root_content_path = "/Game/"
 
-        # Create folders recursively
+        if ijson is not None:
+            # Create folders as the JSON is parsed
+            with open(self.json_file_path, "rb") as file:
+                self.create_folders_from_stream(root_content_path, file)
+            return
+
+        # Load JSON data, parsing the raw bytes with orjson when it's available
+        if orjson is not None:
+            with open(self.json_file_path, "rb") as file:
+                structure = orjson.loads(file.read())
+        else:
+            with open(self.json_file_path, "r") as file:
+                structure = json.load(file)
+
+        # Create folders
         self.create_folders(root_content_path, structure)
 
 if __name__ == "__main__":